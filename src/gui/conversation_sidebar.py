@@ -420,29 +420,34 @@ class ConversationSidebar(QWidget):
     
     def _refresh_list(self):
         """リスト表示を更新"""
-        # 既存のアイテムを削除
-        for widget in self.item_widgets.values():
-            widget.deleteLater()
-        self.item_widgets.clear()
-        
-        # アイテムを再作成
-        for i in range(self.list_layout.count() - 1):  # stretchを除く
-            item = self.list_layout.itemAt(0)
-            if item and item.widget():
-                item.widget().deleteLater()
-            self.list_layout.removeItem(item)
-        
-        for conv in self.filtered_conversations:
-            item_widget = ConversationListItem(conv)
-            item_widget.clicked.connect(self._on_item_clicked)
-            item_widget.doubleClicked.connect(self._on_item_double_clicked)
-            item_widget.contextMenuRequested.connect(self._show_context_menu)
+        # 再構築中の再描画を止め、完了後に一度だけ描画する
+        self.list_container.setUpdatesEnabled(False)
+        try:
+            # 既存のアイテムを削除
+            for widget in self.item_widgets.values():
+                widget.deleteLater()
+            self.item_widgets.clear()
             
-            if conv.id == self.selected_id:
-                item_widget.set_selected(True)
+            # アイテムを再作成
+            for i in range(self.list_layout.count() - 1):  # stretchを除く
+                item = self.list_layout.itemAt(0)
+                if item and item.widget():
+                    item.widget().deleteLater()
+                self.list_layout.removeItem(item)
             
-            self.item_widgets[conv.id] = item_widget
-            self.list_layout.insertWidget(self.list_layout.count() - 1, item_widget)
+            for conv in self.filtered_conversations:
+                item_widget = ConversationListItem(conv)
+                item_widget.clicked.connect(self._on_item_clicked)
+                item_widget.doubleClicked.connect(self._on_item_double_clicked)
+                item_widget.contextMenuRequested.connect(self._show_context_menu)
+                
+                if conv.id == self.selected_id:
+                    item_widget.set_selected(True)
+                
+                self.item_widgets[conv.id] = item_widget
+                self.list_layout.insertWidget(self.list_layout.count() - 1, item_widget)
+        finally:
+            self.list_container.setUpdatesEnabled(True)
         
         # カウント更新
         self.count_label.setText(f"{len(self.filtered_conversations)} conversations")
@@ -901,6 +901,13 @@ class ConversationManager:
 # ============================================================
 
 class MainWindow(QMainWindow):
+    # 文字数カウンターのスタイル（しきい値, スタイル）を大きい順に定義
+    _COUNTER_STYLES = (
+        (50000, f"color: {Colors.DANGER}; font-size: 11px;"),
+        (10000, f"color: {Colors.ACCENT}; font-size: 11px;"),
+        (-1, f"color: {Colors.TEXT_MUTED}; font-size: 11px;"),
+    )
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("LLM Smart Router Pro")
@@ -1092,6 +1099,7 @@ class MainWindow(QMainWindow):
         counter_row = QHBoxLayout()
         self._char_counter = QLabel("0 chars")
         self._char_counter.setObjectName("counter")
+        self._counter_style = None
         counter_row.addWidget(self._char_counter)
         counter_row.addStretch()
 
@@ -1336,12 +1344,11 @@ class MainWindow(QMainWindow):
     def _update_counter(self):
         n = len(self.input_text.toPlainText())
         self._char_counter.setText(f"{n:,} chars")
-        if n > 50000:
-            self._char_counter.setStyleSheet(f"color: {Colors.DANGER}; font-size: 11px;")
-        elif n > 10000:
-            self._char_counter.setStyleSheet(f"color: {Colors.ACCENT}; font-size: 11px;")
-        else:
-            self._char_counter.setStyleSheet(f"color: {Colors.TEXT_MUTED}; font-size: 11px;")
+        style = next(st for limit, st in self._COUNTER_STYLES if n > limit)
+        # 段階が変わった時だけスタイルを再適用（入力毎の QSS 再解析を避ける）
+        if style is not self._counter_style:
+            self._counter_style = style
+            self._char_counter.setStyleSheet(style)
 
     def _on_model_changed(self, idx):
         m = self.model_combo.currentData()
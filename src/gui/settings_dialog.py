@@ -5,38 +5,173 @@
 APIキー管理、ルーター設定、プリセット編集
 """
 
-import os
 import sys
+import json
 from pathlib import Path
+from types import MappingProxyType
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
     QWidget, QFormLayout, QLineEdit, QPushButton,
     QLabel, QMessageBox, QGroupBox, QCheckBox,
     QSpinBox, QDoubleSpinBox, QTextEdit, QFileDialog,
-    QDialogButtonBox, QComboBox, QProgressBar
+    QDialogButtonBox, QComboBox
 )
-from PySide6.QtCore import Qt, QSettings
-from PySide6.QtGui import QFont
+from PySide6.QtCore import QObject, QRunnable, QSettings, QThreadPool, QUrl, Signal
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
 
-# 親ディレクトリをパスに追加
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from security.key_manager import SecureKeyManager
+# 親ディレクトリ（SecureKeyManagerの遅延インポート用）
+_SRC_DIR = str(Path(__file__).parent.parent)
+
+# 設定ストア（全ダイアログで共有、初回使用時に生成）
+_SETTINGS = None
+
+
+def _get_settings():
+    """共有QSettingsを取得"""
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = QSettings('LLMSmartRouter', 'Pro')
+    return _SETTINGS
+
+
+def _create_key_manager():
+    """SecureKeyManagerを生成（keyring等は初回呼び出し時に読み込む）"""
+    if _SRC_DIR not in sys.path:
+        sys.path.insert(0, _SRC_DIR)
+    from security.key_manager import SecureKeyManager
+    return SecureKeyManager()
+
+
+# Anthropic API
+ANTHROPIC_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
+
+# APIキーテスト用リクエストボディ
+_KEY_TEST_PAYLOAD = json.dumps({
+    "model": "claude-sonnet-4-5-20250929",
+    "max_tokens": 10,
+    "messages": [{"role": "user", "content": "Hi"}]
+}).encode('utf-8')
+
+# ダイアログ共通スタイル（ダイアログ生成時に一度だけ適用）
+_CSS = """
+QLabel#apiInfoLabel { color: #10b981; padding: 10px; }
+QLabel#presetInfoLabel { color: #6366f1; padding: 10px; }
+QLineEdit#disabledKeyEdit { background-color: #2d2d2d; color: #666; }
+QLabel#keyringStatus[status="ok"] { color: #10b981; }
+QLabel#keyringStatus[status="error"] { color: #ef4444; }
+"""
+
+
+def _build_data_index(combo):
+    """QComboBoxのuserData → インデックスの対応表を作成"""
+    return {combo.itemData(i): i for i in range(combo.count())}
+
+
+# デフォルトのプリセット内容（読み取り専用）
+_PRESETS = MappingProxyType({
+    'cm_work': {
+        'prompt': '''あなたは建設業のプロフェッショナルアシスタントです。
+以下の観点で回答してください：
+- 建設コストの適正性
+- 工事進捗の管理
+- 品質管理の観点
+- 法令・規制への対応
+- 安全衛生管理''',
+        'model': 'cloud'
+    },
+    'oshi_support': {
+        'prompt': '''あなたは熱心なファンをサポートするアシスタントです。
+以下の観点で回答してください：
+- 配信スケジュールの最適化
+- 応援コメントの作成
+- SNSマーケティング
+- ファンコミュニティ運営
+- コンテンツ企画''',
+        'model': 'cloud'
+    },
+    'coding': {
+        'prompt': '''あなたはエキスパートプログラマーです。
+以下の基準で回答してください：
+- クリーンコードの原則
+- セキュリティベストプラクティス
+- パフォーマンス最適化
+- 可読性と保守性
+- 適切なコメント''',
+        'model': 'auto'
+    },
+    'writing': {
+        'prompt': '''あなたはプロのライターです。
+以下の観点で文章を作成してください：
+- 明確で簡潔な表現
+- 適切なトーンとスタイル
+- 論理的な構成
+- 読者を引き込む導入
+- 具体的な事例の活用''',
+        'model': 'local'
+    }
+})
+_EMPTY_PRESET = MappingProxyType({})
+
+
+class KeyStatusSignals(QObject):
+    """KeyStatusLoader の結果通知用シグナル"""
+    loaded = Signal(object, bool)
+    error = Signal(str)
+
+
+class KeyStatusLoader(QRunnable):
+    """キーストアの初期化とAPIキー有無の確認をバックグラウンドで実行
+
+    スレッドプール上で動くため、ダイアログが先に破棄されてもスレッドは残らない。
+    破棄済みダイアログへの接続は Qt が自動的に切断する。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = KeyStatusSignals()
+
+    def run(self):
+        try:
+            key_manager = _create_key_manager()
+            self.signals.loaded.emit(key_manager, key_manager.has_api_key('anthropic'))
+        except Exception as e:
+            self.signals.error.emit(str(e))
 
 
 class SettingsDialog(QDialog):
     """設定ダイアログ"""
     
+    # タブ番号
+    TAB_API, TAB_ROUTER, TAB_PRESET = range(3)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("⚙️ 設定")
         self.setMinimumSize(600, 500)
+        self.setStyleSheet(_CSS)
+        
+        # キーストアはload_settingsでバックグラウンド読み込み
+        self.key_manager = None
+        self.settings = _get_settings()
         
-        self.key_manager = SecureKeyManager()
-        self.settings = QSettings('LLMSmartRouter', 'Pro')
+        # APIキーテスト用（非同期・接続はダイアログ内で再利用）
+        self._nam = QNetworkAccessManager(self)
+        self._nam.finished.connect(self._on_key_test_finished)
         
+        # タブ構築とキーストア読み込みは初回表示時に行う
+        self._shown = False
         self.init_ui()
-        self.load_settings()
+    
+    def showEvent(self, event):
+        """初回表示時にタブ構築と設定読み込みを開始"""
+        if not self._shown:
+            self._shown = True
+            # キー状態の反映先（APIキータブ）と表示中のタブを構築
+            self._ensure_tab_built(self.TAB_API)
+            self._ensure_tab_built(self.tabs.currentIndex())
+            self.load_settings()
+        super().showEvent(event)
     
     def init_ui(self):
         """UI初期化"""
@@ -46,14 +181,17 @@ class SettingsDialog(QDialog):
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
         
-        # APIキータブ
-        self.tabs.addTab(self.create_api_tab(), "🔐 APIキー")
-        
-        # ルーター設定タブ
-        self.tabs.addTab(self.create_router_tab(), "⚙️ ルーター")
+        # 各タブは初めて表示された時に構築する（最初のタブは showEvent で構築）
+        self._tab_builders = {}
+        for tab_id, builder, title in (
+            (self.TAB_API, self.create_api_tab, "🔐 APIキー"),
+            (self.TAB_ROUTER, self.create_router_tab, "⚙️ ルーター"),
+            (self.TAB_PRESET, self.create_preset_tab, "📋 プリセット"),
+        ):
+            self.tabs.insertTab(tab_id, QWidget(), title)
+            self._tab_builders[tab_id] = builder
         
-        # プリセットタブ
-        self.tabs.addTab(self.create_preset_tab(), "📋 プリセット")
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
         
         # ボタンボックス
         buttons = QDialogButtonBox(
@@ -63,9 +201,18 @@ class SettingsDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
-    def create_api_tab(self):
+    def _ensure_tab_built(self, index):
+        """未構築のタブをページウィジェットに直接構築"""
+        builder = self._tab_builders.pop(index, None)
+        if builder is not None:
+            builder(self.tabs.widget(index))
+    
+    def _is_tab_built(self, index):
+        """タブが構築済みか"""
+        return index not in self._tab_builders
+    
+    def create_api_tab(self, widget):
         """APIキー設定タブ"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 説明
@@ -73,7 +220,7 @@ class SettingsDialog(QDialog):
             "🔒 APIキーはWindows/macOSの標準キーストアに\n"
             "暗号化されて安全に保存されます。"
         )
-        desc.setStyleSheet("color: #10b981; padding: 10px;")
+        desc.setObjectName("apiInfoLabel")
         layout.addWidget(desc)
         
         # Anthropic APIキー
@@ -114,10 +261,9 @@ class SettingsDialog(QDialog):
         self.openai_key.setEchoMode(QLineEdit.Password)
         self.openai_key.setPlaceholderText("sk-...")
         self.openai_key.setEnabled(False)
+        self.openai_key.setObjectName("disabledKeyEdit")
         openai_layout.addRow("APIキー:", self.openai_key)
         
-        self.openai_key.setStyleSheet("background-color: #2d2d2d; color: #666;")
-        
         layout.addWidget(openai_group)
         
         # セキュリティ情報
@@ -125,6 +271,8 @@ class SettingsDialog(QDialog):
         security_layout = QFormLayout(security_info)
         
         self.keyring_status = QLabel("確認中...")
+        self.keyring_status.setObjectName("keyringStatus")
+        self._keyring_ok = None
         security_layout.addRow("キーストア:", self.keyring_status)
         
         self.backend_label = QLabel("-")
@@ -133,12 +281,9 @@ class SettingsDialog(QDialog):
         layout.addWidget(security_info)
         
         layout.addStretch()
-        
-        return widget
     
-    def create_router_tab(self):
+    def create_router_tab(self, widget):
         """ルーター設定タブ"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # パス設定
@@ -167,6 +312,12 @@ class SettingsDialog(QDialog):
         self.default_model.addItem("🧠 自動判定", "auto")
         self.default_model.addItem("🏠 ローカル", "local")
         self.default_model.addItem("☁️ クラウド", "cloud")
+        self._default_model_index = _build_data_index(self.default_model)
+        index = self._default_model_index.get(
+            self.settings.value('default_model', 'auto'), -1
+        )
+        if index >= 0:
+            self.default_model.setCurrentIndex(index)
         default_layout.addRow("デフォルトモデル:", self.default_model)
         
         self.confidence_threshold = QDoubleSpinBox()
@@ -212,16 +363,13 @@ class SettingsDialog(QDialog):
         layout.addWidget(perf_group)
         
         layout.addStretch()
-        
-        return widget
     
-    def create_preset_tab(self):
+    def create_preset_tab(self, widget):
         """プリセット設定タブ"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         desc = QLabel("📋 用途別プリセットのカスタマイズ")
-        desc.setStyleSheet("color: #6366f1; padding: 10px;")
+        desc.setObjectName("presetInfoLabel")
         layout.addWidget(desc)
         
         # プリセット選択
@@ -251,6 +399,7 @@ class SettingsDialog(QDialog):
         self.preset_model.addItem("🧠 自動", "auto")
         self.preset_model.addItem("🏠 ローカル", "local")
         self.preset_model.addItem("☁️ クラウド", "cloud")
+        self._preset_model_index = _build_data_index(self.preset_model)
         layout.addWidget(QLabel("デフォルトモデル:"))
         layout.addWidget(self.preset_model)
         
@@ -272,25 +421,47 @@ class SettingsDialog(QDialog):
         
         # 初期読み込み
         self.load_preset()
-        
-        return widget
     
     def load_settings(self):
         """設定を読み込み"""
-        # APIキー状態確認
-        try:
-            if self.key_manager.get_api_key('anthropic'):
-                self.anthropic_key.setPlaceholderText("✅ 保存済み（変更する場合のみ入力）")
-                self.anthropic_key.clear()
-            
-            backend = self.key_manager.get_backend()
-            self.backend_label.setText(backend)
-            self.keyring_status.setText("✅ 利用可能")
-            self.keyring_status.setStyleSheet("color: #10b981;")
-            
-        except Exception as e:
-            self.keyring_status.setText(f"❌ エラー: {str(e)}")
-            self.keyring_status.setStyleSheet("color: #ef4444;")
+        # APIキー状態確認（キーストアアクセスはUIスレッド外で行う）
+        loader = KeyStatusLoader()
+        loader.signals.loaded.connect(self._on_key_status_loaded)
+        loader.signals.error.connect(self._on_key_status_error)
+        QThreadPool.globalInstance().start(loader)
+    
+    def _on_key_status_loaded(self, key_manager, key_present):
+        """キーストア読み込み完了"""
+        if self.key_manager is None:
+            self.key_manager = key_manager
+        
+        # 読み込み中に入力された値は消さず、プレースホルダーのみ更新
+        if key_present:
+            self.anthropic_key.setPlaceholderText("✅ 保存済み（変更する場合のみ入力）")
+        
+        self.backend_label.setText(self.key_manager.get_backend())
+        self._set_keyring_status("✅ 利用可能", True)
+    
+    def _on_key_status_error(self, msg):
+        """キーストア読み込み失敗"""
+        self._set_keyring_status(f"❌ エラー: {msg}", False)
+    
+    def _get_key_manager(self):
+        """SecureKeyManagerを取得（読み込み前ならその場で生成）"""
+        if self.key_manager is None:
+            self.key_manager = _create_key_manager()
+        return self.key_manager
+    
+    def _set_keyring_status(self, text, ok):
+        """キーストア状態ラベルを更新（状態が変わった時のみ再ポリッシュ）"""
+        self.keyring_status.setText(text)
+        if self._keyring_ok != ok:
+            self._keyring_ok = ok
+            # status プロパティで _CSS のセレクタを切り替える
+            self.keyring_status.setProperty("status", "ok" if ok else "error")
+            style = self.keyring_status.style()
+            style.unpolish(self.keyring_status)
+            style.polish(self.keyring_status)
     
     def toggle_key_visibility(self, checked):
         """APIキー表示切替"""
@@ -303,12 +474,10 @@ class SettingsDialog(QDialog):
     
     def test_anthropic_key(self):
         """Anthropic APIキーのテスト"""
-        import requests
-        
         key = self.anthropic_key.text().strip()
         if not key:
             # 保存済みキーを使用
-            key = self.key_manager.get_api_key('anthropic')
+            key = self._get_key_manager().get_api_key('anthropic')
             if not key:
                 QMessageBox.warning(self, "エラー", "APIキーを入力してください")
                 return
@@ -316,36 +485,36 @@ class SettingsDialog(QDialog):
         self.test_key_btn.setEnabled(False)
         self.test_key_btn.setText("🧪 テスト中...")
         
-        try:
-            response = requests.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json"
-                },
-                json={
-                    "model": "claude-sonnet-4-5-20250929",
-                    "max_tokens": 10,
-                    "messages": [{"role": "user", "content": "Hi"}]
-                },
-                timeout=10
+        request = QNetworkRequest(QUrl(ANTHROPIC_MESSAGES_URL))
+        request.setRawHeader(b"x-api-key", key.encode('utf-8'))
+        request.setRawHeader(b"anthropic-version", b"2023-06-01")
+        request.setRawHeader(b"content-type", b"application/json")
+        request.setTransferTimeout(10000)
+        self._nam.post(request, _KEY_TEST_PAYLOAD)
+    
+    def _on_key_test_finished(self, reply):
+        """APIキーテスト完了"""
+        reply.deleteLater()
+        self._reset_test_button()
+        
+        status_code = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status_code == 200:
+            QMessageBox.information(self, "成功", "✅ APIキーは有効です！")
+        elif status_code is not None:
+            body = bytes(reply.readAll()).decode('utf-8', errors='replace')
+            QMessageBox.warning(
+                self, "エラー",
+                f"❌ APIエラー: {status_code}\n{body[:200]}"
             )
-            
-            if response.status_code == 200:
-                QMessageBox.information(self, "成功", "✅ APIキーは有効です！")
-            else:
-                QMessageBox.warning(
-                    self, "エラー",
-                    f"❌ APIエラー: {response.status_code}\n{response.text[:200]}"
-                )
-                
-        except Exception as e:
-            QMessageBox.critical(self, "エラー", f"❌ 接続失敗: {str(e)}")
-        
-        finally:
-            self.test_key_btn.setEnabled(True)
-            self.test_key_btn.setText("🧪 接続テスト")
+        else:
+            QMessageBox.critical(
+                self, "エラー", f"❌ 接続失敗: {reply.errorString()}"
+            )
+    
+    def _reset_test_button(self):
+        """テストボタンを初期状態に戻す"""
+        self.test_key_btn.setEnabled(True)
+        self.test_key_btn.setText("🧪 接続テスト")
     
     def delete_anthropic_key(self):
         """Anthropic APIキーを削除"""
@@ -356,7 +525,7 @@ class SettingsDialog(QDialog):
         )
         
         if reply == QMessageBox.Yes:
-            if self.key_manager.delete_api_key('anthropic'):
+            if self._get_key_manager().delete_api_key('anthropic'):
                 QMessageBox.information(self, "成功", "APIキーを削除しました")
                 self.anthropic_key.setPlaceholderText("sk-ant-api03-...")
                 self.anthropic_key.clear()
@@ -376,55 +545,11 @@ class SettingsDialog(QDialog):
         """プリセットを読み込み"""
         preset_id = self.preset_combo.currentData()
         
-        # デフォルトのプリセット内容
-        presets = {
-            'cm_work': {
-                'prompt': '''あなたは建設業のプロフェッショナルアシスタントです。
-以下の観点で回答してください：
-- 建設コストの適正性
-- 工事進捗の管理
-- 品質管理の観点
-- 法令・規制への対応
-- 安全衛生管理''',
-                'model': 'cloud'
-            },
-            'oshi_support': {
-                'prompt': '''あなたは熱心なファンをサポートするアシスタントです。
-以下の観点で回答してください：
-- 配信スケジュールの最適化
-- 応援コメントの作成
-- SNSマーケティング
-- ファンコミュニティ運営
-- コンテンツ企画''',
-                'model': 'cloud'
-            },
-            'coding': {
-                'prompt': '''あなたはエキスパートプログラマーです。
-以下の基準で回答してください：
-- クリーンコードの原則
-- セキュリティベストプラクティス
-- パフォーマンス最適化
-- 可読性と保守性
-- 適切なコメント''',
-                'model': 'auto'
-            },
-            'writing': {
-                'prompt': '''あなたはプロのライターです。
-以下の観点で文章を作成してください：
-- 明確で簡潔な表現
-- 適切なトーンとスタイル
-- 論理的な構成
-- 読者を引き込む導入
-- 具体的な事例の活用''',
-                'model': 'local'
-            }
-        }
-        
-        preset = presets.get(preset_id, {})
+        preset = _PRESETS.get(preset_id, _EMPTY_PRESET)
         self.preset_prompt.setText(preset.get('prompt', ''))
         
         model = preset.get('model', 'auto')
-        index = self.preset_model.findData(model)
+        index = self._preset_model_index.get(model, -1)
         if index >= 0:
             self.preset_model.setCurrentIndex(index)
     
@@ -447,19 +572,23 @@ class SettingsDialog(QDialog):
         anthropic_key = self.anthropic_key.text().strip()
         if anthropic_key:
             try:
-                self.key_manager.set_api_key('anthropic', anthropic_key)
+                self._get_key_manager().set_api_key('anthropic', anthropic_key)
             except Exception as e:
                 QMessageBox.critical(self, "エラー", f"APIキー保存失敗: {str(e)}")
                 return
         
-        # ルーターパス保存
-        self.settings.setValue('router_path', self.router_path.text())
-        
-        # デフォルトモデル保存
-        self.settings.setValue('default_model', self.default_model.currentData())
+        # ルーター設定保存（タブ未表示なら変更なし）
+        if self._is_tab_built(self.TAB_ROUTER):
+            self._set_if_changed('router_path', self.router_path.text())
+            self._set_if_changed('default_model', self.default_model.currentData())
         
         QMessageBox.information(self, "保存完了", "設定を保存しました")
         self.accept()
+    
+    def _set_if_changed(self, key, value):
+        """値が変わった時のみQSettingsへ書き込む"""
+        if self.settings.value(key) != value:
+            self.settings.setValue(key, value)
 
 
 if __name__ == '__main__':
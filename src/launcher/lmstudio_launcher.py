@@ -9,8 +9,9 @@ import time
 import threading
 import logging
 import shutil
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +52,24 @@ class LMStudioLauncher:
 
     DEFAULT_ENDPOINT = "http://localhost:1234/v1"
 
+    # ProcessManager に登録するプロセス名
+    PROCESS_NAME = "lmstudio"
+
+    # 実行ファイル探索結果（全インスタンスで共有）: キー → (パス, mtime)
+    _exe_cache: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+
+    # 直接起動時の stderr 出力先（デタッチ後も書き込めるようパイプではなくファイル）
+    # 起動毎に前回分を .1 へローテーションし、最大2世代のみ残す
+    LOG_FILE = Path.home() / ".llm-smart-router" / "logs" / "lmstudio.log"
+    STDERR_TAIL_LINES = 50
+
+    # API待機のポーリング間隔（初回, 倍率）
+    INITIAL_POLL_INTERVAL = 0.05
+    POLL_BACKOFF = 1.5
+
+    # API応答成功を再利用する秒数（直後の重複プローブを省略）
+    READY_TTL = 3.0
+
     def __init__(
         self,
         endpoint: Optional[str] = None,
@@ -67,14 +86,46 @@ class LMStudioLauncher:
         self._executable_path = executable_path
         self._stop_event = threading.Event()
         self._standalone_process = None  # ProcessManager不使用時のPopen参照
+        self._ready_at: Optional[float] = None  # 最後にAPI応答を確認した時刻
+        self.last_stderr_tail = ""  # 起動失敗時の stderr 末尾
+        # ProcessManager経由で起動した時の出力末尾
+        self._output_tail = deque(maxlen=self.STDERR_TAIL_LINES)
 
     def find_executable(self) -> Optional[str]:
         """
         LM Studio実行ファイルを探索
 
+        探索結果はプラットフォーム・LM_STUDIO_PATH・指定パスをキーに
+        クラス単位でキャッシュし、ファイルのmtimeが変わらない限り再利用する。
+
         Returns:
             実行ファイルのパス。見つからない場合はNone
         """
+        key = (
+            sys.platform,
+            os.environ.get("LM_STUDIO_PATH", ""),
+            self._executable_path or "",
+        )
+        cached = LMStudioLauncher._exe_cache.get(key)
+        if cached is not None:
+            path, mtime = cached
+            try:
+                if os.stat(path).st_mtime == mtime:
+                    return path
+            except OSError:
+                pass
+            del LMStudioLauncher._exe_cache[key]
+
+        found = self._search_executable()
+        if found:
+            try:
+                LMStudioLauncher._exe_cache[key] = (found, os.stat(found).st_mtime)
+            except OSError:
+                pass
+        return found
+
+    def _search_executable(self) -> Optional[str]:
+        """LM Studio実行ファイルを探索（キャッシュなし）"""
         # 1. 明示的に指定されたパス
         if self._executable_path:
             path = Path(self._executable_path)
@@ -118,12 +169,19 @@ class LMStudioLauncher:
         """
         LM Studio APIが応答可能かチェック
 
+        READY_TTL 秒以内に応答を確認済みならHTTPプローブを省略する。
+        失敗はキャッシュしない（起動待ちのポーリングに影響させないため）。
+
         Args:
             timeout: 接続タイムアウト（秒）
 
         Returns:
             APIが応答可能ならTrue
         """
+        if (self._ready_at is not None
+                and time.monotonic() - self._ready_at < self.READY_TTL):
+            return True
+
         if not HAS_REQUESTS:
             logger.warning("requestsモジュール未インストール")
             return False
@@ -133,9 +191,12 @@ class LMStudioLauncher:
                 f"{self.endpoint}/models",
                 timeout=timeout,
             )
-            return response.status_code == 200
+            ready = response.status_code == 200
         except Exception:
-            return False
+            ready = False
+
+        self._ready_at = time.monotonic() if ready else None
+        return ready
 
     def is_process_running(self) -> bool:
         """
@@ -196,11 +257,13 @@ class LMStudioLauncher:
 
         # ProcessManager経由で起動
         if process_manager:
+            self.last_stderr_tail = ""
+            self._output_tail.clear()
             success = process_manager.start(
-                name="lmstudio",
+                name=self.PROCESS_NAME,
                 command=[exe_path],
                 detached=True,
-                on_output=lambda name, line: logger.debug(f"[{name}] {line}"),
+                on_output=self._on_process_output,
             )
         else:
             # 直接起動（デタッチモード）
@@ -214,12 +277,17 @@ class LMStudioLauncher:
                 else:
                     kwargs["start_new_session"] = True
 
-                self._standalone_process = subprocess.Popen(
-                    [exe_path],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    **kwargs,
-                )
+                stderr_log = self._open_stderr_log()
+                try:
+                    self._standalone_process = subprocess.Popen(
+                        [exe_path],
+                        stdout=subprocess.DEVNULL,
+                        stderr=stderr_log or subprocess.DEVNULL,
+                        **kwargs,
+                    )
+                finally:
+                    if stderr_log:
+                        stderr_log.close()  # 子プロセス側のハンドルは残る
                 success = True
             except Exception as e:
                 logger.error(f"LM Studio起動失敗: {e}")
@@ -230,7 +298,8 @@ class LMStudioLauncher:
 
         # API応答を待つ
         if wait_ready:
-            return self.wait_for_api(timeout=ready_timeout, poll_interval=poll_interval)
+            return self.wait_for_api(timeout=ready_timeout, poll_interval=poll_interval,
+                                     process_manager=process_manager)
 
         return True
 
@@ -238,30 +307,104 @@ class LMStudioLauncher:
         """待機中のポーリングを中断"""
         self._stop_event.set()
 
-    def wait_for_api(self, timeout: float = 60.0, poll_interval: float = 2.0) -> bool:
+    def wait_for_api(self, timeout: float = 60.0, poll_interval: float = 2.0,
+                     process_manager=None) -> bool:
         """
         LM Studio APIが応答可能になるまで待機
 
         threading.Event を使用しており、request_stop() で中断可能。
+        待機間隔は INITIAL_POLL_INTERVAL から指数的に伸ばし poll_interval で頭打ちにする。
+        起動したプロセスが異常終了した場合はタイムアウトを待たずに失敗を返す。
 
         Args:
             timeout: 最大待ち時間（秒）
-            poll_interval: ポーリング間隔（秒）
+            poll_interval: 最大ポーリング間隔（秒）
+            process_manager: 起動に使ったProcessManager（None時は直接起動したプロセスを監視）
 
         Returns:
             APIが応答可能になればTrue
         """
         self._stop_event.clear()
         start = time.time()
+        delay = min(self.INITIAL_POLL_INTERVAL, poll_interval)
         while time.time() - start < timeout:
             if self.is_api_ready():
                 elapsed = time.time() - start
                 logger.info(f"LM Studio API応答確認 ({elapsed:.1f}秒)")
                 return True
+            if self._process_crashed(process_manager):
+                return False
             # Event.wait は signal で中断可能
-            if self._stop_event.wait(timeout=poll_interval):
+            if self._stop_event.wait(timeout=delay):
                 logger.info("API待機が中断されました")
                 return False
+            delay = min(delay * self.POLL_BACKOFF, poll_interval)
 
         logger.error(f"LM Studio API応答タイムアウト ({timeout}秒)")
+        if process_manager is not None or self._standalone_process is not None:
+            self._log_stderr_tail(process_manager)
         return False
+
+    def _process_crashed(self, process_manager=None) -> bool:
+        """
+        起動したLM Studioプロセスが異常終了したかチェック
+
+        終了コード0は既存インスタンスへの引き継ぎとみなし、API待ちを続ける。
+
+        Args:
+            process_manager: 起動に使ったProcessManager（None時は直接起動したプロセス）
+
+        Returns:
+            異常終了していればTrue
+        """
+        if process_manager is not None:
+            if process_manager.is_alive(self.PROCESS_NAME):
+                return False
+            returncode = process_manager.get_return_code(self.PROCESS_NAME)
+        elif self._standalone_process is not None:
+            returncode = self._standalone_process.poll()
+        else:
+            return False
+
+        if returncode is None or returncode == 0:
+            return False
+        logger.error(f"LM Studioプロセスが終了しました (終了コード: {returncode})")
+        self._log_stderr_tail(process_manager)
+        return True
+
+    def _on_process_output(self, name: str, line: str) -> None:
+        """ProcessManagerからの出力を末尾バッファに保持"""
+        self._output_tail.append(line)
+        logger.debug(f"[{name}] {line}")
+
+    def _open_stderr_log(self):
+        """stderr 出力用ログファイルを開く（前回分はローテーション、失敗時はNone）"""
+        self.last_stderr_tail = ""
+        try:
+            self.LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            if self.LOG_FILE.exists():
+                os.replace(self.LOG_FILE, self.LOG_FILE.with_name(self.LOG_FILE.name + ".1"))
+            return open(self.LOG_FILE, "wb")
+        except OSError as e:
+            logger.warning(f"stderrログファイルを開けません: {e}")
+            return None
+
+    def _log_stderr_tail(self, process_manager=None) -> None:
+        """
+        起動したプロセスの出力末尾を last_stderr_tail に保持してログ出力
+
+        Args:
+            process_manager: 起動に使ったProcessManager（None時はstderrログファイルから読む）
+        """
+        if process_manager is not None:
+            process_manager.join_output(self.PROCESS_NAME, timeout=0.5)
+            tail = list(self._output_tail)
+        else:
+            try:
+                with open(self.LOG_FILE, "r", encoding="utf-8", errors="replace") as f:
+                    tail = [line.rstrip("\n") for line in deque(f, maxlen=self.STDERR_TAIL_LINES)]
+            except OSError:
+                return
+        self.last_stderr_tail = "\n".join(tail)
+        if self.last_stderr_tail:
+            logger.error(f"LM Studio stderr (末尾{len(tail)}行):\n{self.last_stderr_tail}")
@@ -232,6 +232,23 @@ class ProcessManager:
             proc = self._processes[name].process
             return proc.pid if proc else None
 
+    def join_output(self, name: str, timeout: float = 1.0) -> None:
+        """出力読み取りスレッドの終了を待つ（終了後の出力を取りこぼさないため）"""
+        with self._lock:
+            managed = self._processes.get(name)
+            log_thread = managed.log_thread if managed else None
+        if log_thread is not None:
+            log_thread.join(timeout)
+
+    def get_return_code(self, name: str) -> Optional[int]:
+        """終了したプロセスの終了コードを取得（生存中・未登録ならNone）"""
+        # まず生存チェックで終了コードを更新
+        self.is_alive(name)
+        with self._lock:
+            if name not in self._processes:
+                return None
+            return self._processes[name].return_code
+
     def get_status(self, name: str) -> Optional[ProcessStatus]:
         """プロセスの状態を取得"""
         # まず生存チェックで状態を更新
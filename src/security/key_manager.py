@@ -28,8 +28,9 @@ import json
 import base64
 import hashlib
 import getpass
+import time
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -84,6 +85,13 @@ class SecureKeyManager:
         'azure': 'Azure OpenAI API'
     }
     
+    # キー有無チェックのキャッシュ有効期間（秒）
+    PRESENCE_TTL = 30.0
+    
+    # インスタンス間で共有するキャッシュ（APIキー本体は保持しない）
+    _backend_cache: Optional[str] = None
+    _presence_cache: Dict[str, Tuple[bool, float]] = {}
+    
     def __init__(self):
         self._cache: Dict[str, str] = {}
         self._backend = None
@@ -103,7 +111,19 @@ class SecureKeyManager:
             self.CONFIG_DIR.chmod(stat.S_IRWXU)  # 所有者のみアクセス可能
     
     def _init_backend(self):
-        """バックエンドを初期化"""
+        """バックエンドを初期化（判定結果はプロセス内で再利用）"""
+        if SecureKeyManager._backend_cache is not None:
+            self._backend = SecureKeyManager._backend_cache
+            return
+        
+        self._detect_backend()
+        # keyringの一時的な失敗（ログイン直後のDBus未起動など）によるファイル
+        # フォールバックは固定せず、次のインスタンスで再判定する
+        if self._backend != 'file' or not KEYRING_AVAILABLE:
+            SecureKeyManager._backend_cache = self._backend
+    
+    def _detect_backend(self):
+        """利用可能なバックエンドを判定"""
         if not KEYRING_AVAILABLE:
             self._backend = 'file'
             return
@@ -345,6 +365,7 @@ class SecureKeyManager:
             
             # キャッシュ更新
             self._cache[provider] = api_key
+            self._presence_cache.pop(provider, None)
             
             # メタデータ作成
             self._metadata[provider] = APIKeyMetadata(
@@ -386,6 +407,7 @@ class SecureKeyManager:
             # キャッシュ削除
             if provider in self._cache:
                 del self._cache[provider]
+            self._presence_cache.pop(provider, None)
             
             # メタデータ削除
             if provider in self._metadata:
@@ -399,8 +421,14 @@ class SecureKeyManager:
             return False
     
     def has_api_key(self, provider: str) -> bool:
-        """APIキーが設定されているかチェック"""
-        return self.get_api_key(provider) is not None
+        """APIキーが設定されているかチェック（結果はPRESENCE_TTL秒キャッシュ）"""
+        cached = self._presence_cache.get(provider)
+        if cached is not None and time.monotonic() - cached[1] < self.PRESENCE_TTL:
+            return cached[0]
+        
+        present = self.get_api_key(provider) is not None
+        self._presence_cache[provider] = (present, time.monotonic())
+        return present
     
     def get_all_providers(self) -> Dict[str, str]:
         """サポートするすべてのプロバイダーを返す"""
@@ -421,6 +449,7 @@ class SecureKeyManager:
     def clear_cache(self):
         """メモリキャッシュをクリア"""
         self._cache.clear()
+        self._presence_cache.clear()
     
     def secure_delete(self, provider: str) -> bool:
         """
@@ -0,0 +1,110 @@
+"""
+SecureKeyManager テスト
+バックエンド判定・キー有無キャッシュの単体テスト
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# プロジェクトルートをパスに追加
+PROJECT_ROOT = Path(__file__).parent.parent
+_src_path = str(PROJECT_ROOT / "src")
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
+
+from security.key_manager import SecureKeyManager
+
+
+@pytest.fixture
+def key_manager_cls(tmp_path, monkeypatch):
+    """設定ディレクトリを一時領域に向け、共有キャッシュを初期化"""
+    config_dir = tmp_path / ".llm-smart-router"
+    monkeypatch.setattr(SecureKeyManager, "CONFIG_DIR", config_dir)
+    monkeypatch.setattr(SecureKeyManager, "KEY_FILE", config_dir / "keys.enc")
+    monkeypatch.setattr(SecureKeyManager, "META_FILE", config_dir / "keys.meta")
+    monkeypatch.setattr(SecureKeyManager, "_backend_cache", None)
+    monkeypatch.setattr(SecureKeyManager, "_presence_cache", {})
+    return SecureKeyManager
+
+
+class TestBackendCache:
+    """バックエンド判定キャッシュのテスト"""
+
+    def test_backend_detected_once(self, key_manager_cls):
+        with patch.object(key_manager_cls, "_detect_backend", autospec=True) as mock_detect:
+            mock_detect.side_effect = lambda self: setattr(self, "_backend", "file")
+            first = key_manager_cls()
+            second = key_manager_cls()
+
+        assert mock_detect.call_count == 1
+        assert first.get_backend() == "file"
+        assert second.get_backend() == "file"
+
+    def test_keyring_failure_not_cached(self, key_manager_cls):
+        """keyringの一時的な失敗によるファイルフォールバックは固定しない"""
+        mock_keyring = MagicMock()
+        mock_keyring.get_password.side_effect = [RuntimeError("DBus not running"), None]
+        with patch("security.key_manager.KEYRING_AVAILABLE", True), \
+                patch("security.key_manager.keyring", mock_keyring, create=True):
+            first = key_manager_cls()
+            second = key_manager_cls()
+
+        assert first.get_backend() == "file"
+        assert second.get_backend() != "file"
+        assert key_manager_cls._backend_cache == second.get_backend()
+
+    def test_file_backend_cached_without_keyring(self, key_manager_cls):
+        """keyring未インストール時のファイルバックエンドはキャッシュする"""
+        with patch("security.key_manager.KEYRING_AVAILABLE", False):
+            key_manager_cls()
+        assert key_manager_cls._backend_cache == "file"
+
+
+class TestPresenceCache:
+    """キー有無キャッシュのテスト"""
+
+    def test_has_api_key_cached(self, key_manager_cls):
+        km = key_manager_cls()
+        with patch.object(km, "get_api_key", return_value="sk-test") as mock_get:
+            assert km.has_api_key("anthropic") is True
+            assert km.has_api_key("anthropic") is True
+        assert mock_get.call_count == 1
+
+    def test_cache_shared_across_instances(self, key_manager_cls):
+        first = key_manager_cls()
+        with patch.object(first, "get_api_key", return_value=None):
+            assert first.has_api_key("anthropic") is False
+
+        second = key_manager_cls()
+        with patch.object(second, "get_api_key", return_value="sk-test") as mock_get:
+            assert second.has_api_key("anthropic") is False
+        mock_get.assert_not_called()
+
+    def test_cache_expires(self, key_manager_cls, monkeypatch):
+        monkeypatch.setattr(key_manager_cls, "PRESENCE_TTL", 0.0)
+        km = key_manager_cls()
+        with patch.object(km, "get_api_key", return_value=None) as mock_get:
+            km.has_api_key("anthropic")
+            km.has_api_key("anthropic")
+        assert mock_get.call_count == 2
+
+    def test_set_api_key_invalidates(self, key_manager_cls):
+        km = key_manager_cls()
+        with patch.object(km, "get_api_key", return_value=None):
+            assert km.has_api_key("anthropic") is False
+
+        with patch.object(km, "_file_store_set"):
+            assert km.set_api_key("anthropic", "sk-new") is True
+        assert km.has_api_key("anthropic") is True
+
+    def test_delete_api_key_invalidates(self, key_manager_cls):
+        km = key_manager_cls()
+        with patch.object(km, "get_api_key", return_value="sk-test"):
+            assert km.has_api_key("anthropic") is True
+
+        with patch.object(km, "_file_store_delete", return_value=True):
+            assert km.delete_api_key("anthropic") is True
+        assert km.has_api_key("anthropic") is False
@@ -113,6 +113,20 @@ class TestProcessManager:
         pm = ProcessManager()
         assert pm.get_status("nonexistent") is None
 
+    def test_get_return_code_nonexistent(self):
+        """存在しないプロセスの終了コード取得"""
+        pm = ProcessManager()
+        assert pm.get_return_code("nonexistent") is None
+
+    def test_get_return_code_after_exit(self):
+        """終了したプロセスの終了コード取得"""
+        pm = ProcessManager()
+        pm.start("exit3", [sys.executable, "-c", "import sys; sys.exit(3)"])
+        deadline = time.time() + 5
+        while pm.is_alive("exit3") and time.time() < deadline:
+            time.sleep(0.05)
+        assert pm.get_return_code("exit3") == 3
+
     def test_get_all_status(self):
         """全プロセス状態取得テスト"""
         pm = ProcessManager()
@@ -190,6 +204,13 @@ class TestProcessManager:
 class TestLMStudioLauncher:
     """LMStudioLauncher の単体テスト"""
 
+    @pytest.fixture(autouse=True)
+    def log_file(self, tmp_path, monkeypatch):
+        """stderrログを一時領域に向ける（実ホームのログを読まない）"""
+        path = tmp_path / "logs" / "lmstudio.log"
+        monkeypatch.setattr(LMStudioLauncher, "LOG_FILE", path)
+        return path
+
     def test_init_defaults(self):
         launcher = LMStudioLauncher()
         assert "localhost:1234" in launcher.endpoint
@@ -231,6 +252,34 @@ class TestLMStudioLauncher:
         # 見つからないはず（テスト環境依存）
         assert result is None or isinstance(result, str)
 
+    def test_find_executable_cached_across_instances(self, tmp_path, monkeypatch):
+        """探索結果はインスタンス間で共有される"""
+        monkeypatch.setattr(LMStudioLauncher, "_exe_cache", {})
+        fake_exe = tmp_path / "lm-studio"
+        fake_exe.touch()
+
+        assert LMStudioLauncher(executable_path=str(fake_exe)).find_executable() == str(fake_exe)
+        with patch.object(LMStudioLauncher, "_search_executable") as mock_search:
+            result = LMStudioLauncher(executable_path=str(fake_exe)).find_executable()
+        assert result == str(fake_exe)
+        mock_search.assert_not_called()
+
+    def test_find_executable_cache_invalidated_on_mtime(self, tmp_path, monkeypatch):
+        """実行ファイルのmtimeが変わったら再探索"""
+        monkeypatch.setattr(LMStudioLauncher, "_exe_cache", {})
+        fake_exe = tmp_path / "lm-studio"
+        fake_exe.touch()
+
+        launcher = LMStudioLauncher(executable_path=str(fake_exe))
+        launcher.find_executable()
+        stat = fake_exe.stat()
+        os.utime(fake_exe, (stat.st_atime, stat.st_mtime + 10))
+
+        with patch.object(LMStudioLauncher, "_search_executable",
+                          return_value=str(fake_exe)) as mock_search:
+            assert launcher.find_executable() == str(fake_exe)
+        mock_search.assert_called_once()
+
     @patch("launcher.lmstudio_launcher.HAS_REQUESTS", True)
     @patch("launcher.lmstudio_launcher.requests")
     def test_is_api_ready_success(self, mock_requests):
@@ -251,6 +300,44 @@ class TestLMStudioLauncher:
         launcher = LMStudioLauncher()
         assert launcher.is_api_ready() is False
 
+    @patch("launcher.lmstudio_launcher.HAS_REQUESTS", True)
+    @patch("launcher.lmstudio_launcher.requests")
+    def test_is_api_ready_success_cached(self, mock_requests):
+        """API応答成功はTTL内で再利用される"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_requests.get.return_value = mock_response
+
+        launcher = LMStudioLauncher()
+        assert launcher.is_api_ready() is True
+        assert launcher.is_api_ready() is True
+        assert mock_requests.get.call_count == 1
+
+    @patch("launcher.lmstudio_launcher.HAS_REQUESTS", True)
+    @patch("launcher.lmstudio_launcher.requests")
+    def test_is_api_ready_failure_not_cached(self, mock_requests):
+        """API応答失敗は毎回プローブし直す"""
+        mock_requests.get.side_effect = Exception("Connection refused")
+
+        launcher = LMStudioLauncher()
+        assert launcher.is_api_ready() is False
+        assert launcher.is_api_ready() is False
+        assert mock_requests.get.call_count == 2
+
+    @patch("launcher.lmstudio_launcher.HAS_REQUESTS", True)
+    @patch("launcher.lmstudio_launcher.requests")
+    def test_is_api_ready_cache_expires(self, mock_requests):
+        """TTL経過後は再プローブする"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_requests.get.return_value = mock_response
+
+        launcher = LMStudioLauncher()
+        launcher.READY_TTL = 0.0
+        launcher.is_api_ready()
+        launcher.is_api_ready()
+        assert mock_requests.get.call_count == 2
+
     @patch("launcher.lmstudio_launcher.HAS_REQUESTS", False)
     def test_is_api_ready_no_requests(self):
         """requestsモジュールなし"""
@@ -272,6 +359,130 @@ class TestLMStudioLauncher:
         result = launcher.launch(wait_ready=False)
         assert result is False
 
+    def test_wait_for_api_backoff(self):
+        """ポーリング間隔は指数的に伸び poll_interval で頭打ち"""
+        launcher = LMStudioLauncher()
+        launcher._stop_event = MagicMock()
+        launcher._stop_event.wait.return_value = False
+        with patch.object(launcher, "is_api_ready", side_effect=[False] * 5 + [True]):
+            assert launcher.wait_for_api(timeout=10, poll_interval=0.1) is True
+
+        delays = [c.kwargs["timeout"] for c in launcher._stop_event.wait.call_args_list]
+        assert delays[0] == pytest.approx(0.05)
+        assert delays[1] == pytest.approx(0.075)
+        assert max(delays) == pytest.approx(0.1)
+
+    @patch.object(LMStudioLauncher, "is_api_ready", return_value=False)
+    def test_wait_for_api_process_crashed(self, mock_ready):
+        """直接起動したプロセスが異常終了したら即座に失敗"""
+        launcher = LMStudioLauncher()
+        launcher._standalone_process = MagicMock()
+        launcher._standalone_process.poll.return_value = 1
+
+        start = time.time()
+        assert launcher.wait_for_api(timeout=30, poll_interval=2.0) is False
+        assert time.time() - start < 1.0
+
+    def test_wait_for_api_process_exit_zero_keeps_waiting(self):
+        """終了コード0（既存インスタンスへの引き継ぎ）ではAPI待ちを継続"""
+        launcher = LMStudioLauncher()
+        launcher._standalone_process = MagicMock()
+        launcher._standalone_process.poll.return_value = 0
+        with patch.object(launcher, "is_api_ready", side_effect=[False, True]):
+            assert launcher.wait_for_api(timeout=5, poll_interval=0.1) is True
+
+    @patch.object(LMStudioLauncher, "is_api_ready", return_value=False)
+    def test_wait_for_api_process_manager_crashed(self, mock_ready):
+        """ProcessManager経由で起動したプロセスが異常終了したら即座に失敗"""
+        pm = MagicMock()
+        pm.is_alive.return_value = False
+        pm.get_return_code.return_value = 1
+
+        launcher = LMStudioLauncher()
+        start = time.time()
+        assert launcher.wait_for_api(timeout=30, poll_interval=2.0, process_manager=pm) is False
+        assert time.time() - start < 1.0
+        pm.is_alive.assert_called_with(LMStudioLauncher.PROCESS_NAME)
+
+    def test_wait_for_api_process_manager_exit_zero_keeps_waiting(self):
+        """ProcessManager経由でも終了コード0ならAPI待ちを継続"""
+        pm = MagicMock()
+        pm.is_alive.return_value = False
+        pm.get_return_code.return_value = 0
+
+        launcher = LMStudioLauncher()
+        with patch.object(launcher, "is_api_ready", side_effect=[False, True]):
+            assert launcher.wait_for_api(timeout=5, poll_interval=0.1, process_manager=pm) is True
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="シェルスクリプトを使用")
+    @patch.object(LMStudioLauncher, "is_api_ready", return_value=False)
+    def test_launch_process_manager_crash_fails_fast(self, mock_ready, tmp_path):
+        """ProcessManager経由の起動直後クラッシュはタイムアウトを待たない"""
+        fake_exe = tmp_path / "lm-studio"
+        fake_exe.write_text("#!/bin/sh\nexit 3\n")
+        fake_exe.chmod(0o755)
+
+        launcher = LMStudioLauncher(executable_path=str(fake_exe))
+        start = time.time()
+        result = launcher.launch(process_manager=ProcessManager(),
+                                 ready_timeout=30, poll_interval=0.1)
+        assert result is False
+        assert time.time() - start < 5.0
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="シェルスクリプトを使用")
+    def test_launch_crash_captures_stderr(self, tmp_path, log_file):
+        """起動直後に異常終了したら stderr 末尾を保持して失敗"""
+        fake_exe = tmp_path / "lm-studio"
+        fake_exe.write_text("#!/bin/sh\necho 'fatal: model load failed' >&2\nexit 3\n")
+        fake_exe.chmod(0o755)
+
+        launcher = LMStudioLauncher(executable_path=str(fake_exe))
+        with patch.object(launcher, "is_api_ready", return_value=False):
+            assert launcher.launch(ready_timeout=10, poll_interval=0.1) is False
+
+        assert "fatal: model load failed" in launcher.last_stderr_tail
+        assert log_file.exists()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="シェルスクリプトを使用")
+    def test_launch_process_manager_crash_captures_output(self, tmp_path):
+        """ProcessManager経由の起動でも異常終了時に出力末尾を保持"""
+        fake_exe = tmp_path / "lm-studio"
+        fake_exe.write_text("#!/bin/sh\necho 'fatal: model load failed' >&2\nexit 3\n")
+        fake_exe.chmod(0o755)
+
+        launcher = LMStudioLauncher(executable_path=str(fake_exe))
+        with patch.object(launcher, "is_api_ready", return_value=False):
+            result = launcher.launch(process_manager=ProcessManager(),
+                                     ready_timeout=10, poll_interval=0.1)
+
+        assert result is False
+        assert launcher.last_stderr_tail == "fatal: model load failed"
+
+    def test_stderr_log_rotated_on_launch(self, log_file):
+        """直接起動の度に前回のstderrログを .1 へローテーション"""
+        log_file.parent.mkdir(parents=True)
+        log_file.write_text("previous run\n")
+
+        launcher = LMStudioLauncher()
+        stderr_log = launcher._open_stderr_log()
+        stderr_log.close()
+
+        assert log_file.read_text() == ""
+        assert (log_file.parent / "lmstudio.log.1").read_text() == "previous run\n"
+
+    def test_stderr_tail_keeps_last_lines(self, log_file):
+        """stderr 末尾は STDERR_TAIL_LINES 行まで"""
+        launcher = LMStudioLauncher()
+        log_file.parent.mkdir(parents=True)
+        log_file.write_text("".join(f"line {i}\n" for i in range(100)))
+        launcher._standalone_process = MagicMock()
+        launcher._standalone_process.poll.return_value = 1
+
+        assert launcher._process_crashed() is True
+        lines = launcher.last_stderr_tail.splitlines()
+        assert len(lines) == LMStudioLauncher.STDERR_TAIL_LINES
+        assert lines[-1] == "line 99"
+
 
 # ============================================================
 # LaunchConfig テスト
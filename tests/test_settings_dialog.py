@@ -0,0 +1,208 @@
+"""
+SettingsDialog テスト
+キーストア読み込み・タブ遅延構築・設定保存・APIキーテストの単体テスト
+
+注意:
+    PySide6 をヘッドレス（offscreen）モードで使用します。
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# プロジェクトルートをパスに追加
+PROJECT_ROOT = Path(__file__).parent.parent
+_src_path = str(PROJECT_ROOT / "src")
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QSettings, QThreadPool
+from PySide6.QtWidgets import QApplication
+
+from gui import settings_dialog
+from gui.settings_dialog import SettingsDialog
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """QApplication（モジュール内で共有）"""
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """ダイアログの設定ストアを一時INIファイルに向ける"""
+    store = QSettings(str(tmp_path / "settings.ini"), QSettings.IniFormat)
+    monkeypatch.setattr(settings_dialog, "_SETTINGS", store)
+    return store
+
+
+@pytest.fixture
+def key_manager(monkeypatch):
+    """キーストアをモックに差し替え"""
+    km = MagicMock()
+    km.has_api_key.return_value = False
+    km.get_backend.return_value = "file"
+    monkeypatch.setattr(settings_dialog, "_create_key_manager", lambda: km)
+    return km
+
+
+def _drain_key_loader():
+    """キーストア読み込みの完了を待ち、結果シグナルを配送"""
+    QThreadPool.globalInstance().waitForDone(5000)
+    QCoreApplication.processEvents()
+
+
+class TestKeyStatusLoader:
+    """キーストアのバックグラウンド読み込みのテスト"""
+
+    def test_status_applied_after_show(self, qapp, settings, key_manager):
+        dialog = SettingsDialog()
+        dialog.show()
+        _drain_key_loader()
+
+        assert dialog.key_manager is key_manager
+        assert dialog.backend_label.text() == "file"
+        dialog.close()
+
+    def test_dialog_destroyed_before_loader_finishes(self, qapp, settings, monkeypatch):
+        """読み込み中にダイアログを破棄してもクラッシュしない"""
+        km = MagicMock()
+        km.has_api_key.return_value = True
+
+        def slow_key_manager():
+            time.sleep(0.5)
+            return km
+
+        monkeypatch.setattr(settings_dialog, "_create_key_manager", slow_key_manager)
+
+        dialog = SettingsDialog()
+        dialog.show()
+        dialog.reject()
+        dialog.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        # 読み込みが終わるまで待ち、破棄済みダイアログへの通知も配送させる
+        deadline = time.monotonic() + 5.0
+        while not km.has_api_key.called and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.01)
+        _drain_key_loader()
+        km.has_api_key.assert_called_once_with('anthropic')
+
+
+@pytest.fixture
+def message_box(monkeypatch):
+    """QMessageBox をモックに差し替え（モーダル表示を避ける）"""
+    box = MagicMock()
+    monkeypatch.setattr(settings_dialog, "QMessageBox", box)
+    return box
+
+
+@pytest.fixture
+def dialog(qapp, settings, key_manager, message_box):
+    """表示済みのSettingsDialog"""
+    dlg = SettingsDialog()
+    dlg.show()
+    _drain_key_loader()
+    yield dlg
+    dlg.close()
+
+
+class TestLazyTabs:
+    """タブ遅延構築と設定保存のテスト"""
+
+    def test_router_tab_not_built_until_opened(self, dialog):
+        assert not dialog._is_tab_built(SettingsDialog.TAB_ROUTER)
+        dialog.tabs.setCurrentIndex(SettingsDialog.TAB_ROUTER)
+        assert dialog._is_tab_built(SettingsDialog.TAB_ROUTER)
+
+    def test_save_without_router_tab_keeps_values(self, dialog, settings):
+        """ルータータブ未表示のまま保存しても既存値は変わらない"""
+        settings.setValue('router_path', '/opt/router')
+        settings.setValue('default_model', 'cloud')
+
+        dialog.save_settings()
+
+        assert not dialog._is_tab_built(SettingsDialog.TAB_ROUTER)
+        assert settings.value('router_path') == '/opt/router'
+        assert settings.value('default_model') == 'cloud'
+
+    def test_saved_default_model_restored(self, qapp, settings, key_manager, message_box):
+        """保存済みのデフォルトモデルがルーター設定タブに復元される"""
+        settings.setValue('default_model', 'cloud')
+        dlg = SettingsDialog()
+        dlg.show()
+        dlg.tabs.setCurrentIndex(SettingsDialog.TAB_ROUTER)
+
+        assert dlg.default_model.currentData() == 'cloud'
+        _drain_key_loader()
+        dlg.close()
+
+    def test_unchanged_save_writes_nothing(self, dialog, settings, monkeypatch):
+        """値が変わっていなければQSettingsへ書き込まない"""
+        settings.setValue('router_path', '/opt/router')
+        settings.setValue('default_model', 'local')
+        dialog.tabs.setCurrentIndex(SettingsDialog.TAB_ROUTER)
+
+        spy = MagicMock(wraps=settings)
+        monkeypatch.setattr(dialog, "settings", spy)
+        dialog.save_settings()
+
+        spy.setValue.assert_not_called()
+
+    def test_changed_save_writes_value(self, dialog, settings):
+        settings.setValue('default_model', 'local')
+        dialog.tabs.setCurrentIndex(SettingsDialog.TAB_ROUTER)
+        dialog.default_model.setCurrentIndex(
+            dialog._default_model_index['cloud']
+        )
+
+        dialog.save_settings()
+
+        assert settings.value('default_model') == 'cloud'
+
+
+class TestKeyTestReply:
+    """APIキーテスト応答の表示テスト"""
+
+    @staticmethod
+    def _reply(status_code, body=b"", error=""):
+        reply = MagicMock()
+        reply.attribute.return_value = status_code
+        reply.readAll.return_value = body
+        reply.errorString.return_value = error
+        return reply
+
+    def test_success(self, dialog, message_box):
+        dialog.test_key_btn.setEnabled(False)
+        dialog._on_key_test_finished(self._reply(200))
+
+        message_box.information.assert_called_once()
+        message_box.warning.assert_not_called()
+        message_box.critical.assert_not_called()
+        assert dialog.test_key_btn.isEnabled()
+
+    def test_api_error(self, dialog, message_box):
+        body = b'{"error": {"message": "invalid x-api-key"}}'
+        dialog._on_key_test_finished(self._reply(401, body))
+
+        message_box.warning.assert_called_once()
+        text = message_box.warning.call_args.args[2]
+        assert "401" in text
+        assert "invalid x-api-key" in text
+        message_box.information.assert_not_called()
+
+    def test_transport_error(self, dialog, message_box):
+        dialog._on_key_test_finished(self._reply(None, error="Host not found"))
+
+        message_box.critical.assert_called_once()
+        assert "Host not found" in message_box.critical.call_args.args[2]
+        message_box.information.assert_not_called()
+        message_box.warning.assert_not_called()